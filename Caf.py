@@ -1,674 +1,644 @@
+import argparse
+import functools
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import warnings
-warnings.filterwarnings('ignore')
+
+# Recommandations stratégiques propres à chaque spécificité de territoire
+RECOMMENDATIONS = {
+    "precarite": (
+        "• Renforcer les dispositifs de lutte contre la précarité",
+        "• Développer les accompagnements vers l'emploi",
+    ),
+    "familles_nombreuses": (
+        "• Adapter les prestations aux spécificités des familles nombreuses",
+        "• Développer les services de soutien à la parentalité",
+    ),
+    "jeunesse": (
+        "• Renforcer les aides à l'éducation et la formation",
+        "• Développer les programmes d'insertion professionnelle des jeunes",
+    ),
+    "isolement": (
+        "• Développer les services à distance et la dématérialisation",
+        "• Renforcer les partenariats locaux pour améliorer l'accès aux droits",
+    ),
+}
+
+@functools.lru_cache(maxsize=None)
+def _pyplot():
+    """Importe pyplot au premier tracé: la génération seule des données s'en passe"""
+    import matplotlib
+    if os.environ.get('CAF_HEADLESS'):
+        matplotlib.use('Agg')  # Exécution sans affichage: pas d'initialisation de backend graphique
+    import matplotlib.pyplot as plt
+    # Style commun des sous-graphiques, défini une fois plutôt qu'à chaque appel
+    # (la feuille de style d'abord, pour que les réglages suivants la complètent)
+    plt.style.use('seaborn-v0_8')
+    plt.rcParams.update({
+        'axes.titlesize': 12,
+        'axes.titleweight': 'bold',
+        'axes.grid': True,
+        'grid.alpha': 0.3,
+    })
+    return plt
+
+def _simulate_all(steps, bases, rates, noise, out):
+    """Calcule toutes les séries en une passe: base * (1 + taux*t) * bruit"""
+    np.multiply(rates, steps, out=out)
+    out += 1
+    out *= bases
+    out *= noise
+    return out
 
 class CAF_DROMCOMAnalyzer:
-    def __init__(self, territoire_name):
+    # Séries simulées, dans l'ordre des colonnes du jeu de données:
+    # (colonne, méthode renvoyant la base et le taux de croissance, écart-type du bruit relatif)
+    _SERIES = (
+        # Données démographiques
+        ('Nombre_Allocataires', '_params_allocataires', 0.0),
+        ('Prestations_Versees', '_params_prestations', 0.07),
+        # Recettes de la CAF
+        ('Recettes_Totales', '_params_total_revenue', 0.08),
+        ('Cotisations_Sociales', '_params_social_contributions', 0.06),
+        ('Contributions_Etat', '_params_state_contributions', 0.05),
+        ('Autres_Recettes', '_params_other_revenue', 0.10),
+        # Dépenses de la CAF
+        ('Depenses_Totales', '_params_total_expenses', 0.07),
+        ('Prestations_Familiales', '_params_family_benefits', 0.06),
+        ('Prestations_Logement', '_params_housing_benefits', 0.08),
+        ('Prestations_Solidarite', '_params_solidarity_benefits', 0.09),
+        ('Frais_Gestion', '_params_management_costs', 0.04),
+        # Indicateurs financiers
+        ('Taux_Couverture', '_params_coverage_rate', 0.03),
+        ('Ratio_Gestion', '_params_management_ratio', 0.02),
+        ('Solde_Compte', '_params_account_balance', 0.15),
+        # Prestations spécifiques adaptées aux DROM-COM
+        ('Allocations_Familiales', '_params_family_allocations', 0.06),
+        ('ARS', '_params_ars', 0.07),
+        ('APL', '_params_apl', 0.08),
+        ('RSA', '_params_rsa', 0.09),
+        ('Prime_Naissance', '_params_birth_grant', 0.10),
+    )
+    
+    # Ratios (sans unité monétaire), écrits avec plus de décimales dans le CSV
+    _RATIO_COLUMNS = ('Taux_Couverture', 'Ratio_Gestion')
+    
+    # Effectifs stockés en entiers; toutes les autres séries en float32
+    _INT32_COLUMNS = ('Nombre_Allocataires',)
+    
+    _COLUMN_INDEX = {column: j for j, (column, *_) in enumerate(_SERIES)}
+    _SIGMAS = np.array([sigma for *_, sigma in _SERIES])
+    
+    # Séries qui n'évoluent qu'à partir de 2010 (constantes auparavant)
+    _SINCE_2010 = frozenset({'Contributions_Etat', 'Taux_Couverture', 'Ratio_Gestion', 'Solde_Compte'})
+    
+    # Tendances spécifiques aux CAF DROM-COM: (première année, dernière année, facteurs)
+    _TRENDS = (
+        # Développement initial (2002-2005)
+        (2002, 2005, {'Contributions_Etat': 1.1, 'Prestations_Familiales': 1.15}),
+        # Réforme des prestations (2006-2010) et mise en place du RSA
+        (2006, 2010, {'RSA': 1.25, 'Prestations_Solidarite': 1.3}),
+        # Impact de la crise financière (2008-2009)
+        (2008, 2009, {'Cotisations_Sociales': 0.92, 'RSA': 1.15}),
+        # Renforcement des politiques sociales (2011-2015)
+        (2011, 2015, {'Contributions_Etat': 1.12, 'Allocations_Familiales': 1.08}),
+        # Mouvements sociaux de 2017 et renforcement des aides
+        (2017, 2017, {'Contributions_Etat': 1.18, 'RSA': 1.10}),
+        # Impact de la crise COVID-19 (2020)
+        (2020, 2020, {'Cotisations_Sociales': 0.85, 'Contributions_Etat': 1.25, 'RSA': 1.35}),
+        # Plan de relance post-COVID (à partir de 2022)
+        (2022, np.inf, {'Contributions_Etat': 1.08, 'Prestations_Logement': 1.12, 'ARS': 1.10}),
+    )
+    
+    # Configuration spécifique à chaque territoire DROM-COM (construite une seule fois)
+    _CONFIGS = {
+        "Guadeloupe": {
+            "allocataires_base": 120000,
+            "budget_base": 450,
+            "specificites": ("familles_nombreuses", "precarite", "vieillesse")
+        },
+        "Martinique": {
+            "allocataires_base": 110000,
+            "budget_base": 420,
+            "specificites": ("vieillesse", "dependance", "handicap")
+        },
+        "Guyane": {
+            "allocataires_base": 85000,
+            "budget_base": 380,
+            "specificites": ("jeunesse", "familles_nombreuses", "precarite")
+        },
+        "La Réunion": {
+            "allocataires_base": 220000,
+            "budget_base": 680,
+            "specificites": ("precarite", "emploi", "familles_monoparentales")
+        },
+        "Mayotte": {
+            "allocataires_base": 65000,
+            "budget_base": 280,
+            "specificites": ("jeunesse", "familles_nombreuses", "precarite_elevee")
+        },
+        "Saint-Martin": {
+            "allocataires_base": 18000,
+            "budget_base": 85,
+            "specificites": ("tourisme", "petite_enfance", "precarite")
+        },
+        "Saint-Barthélemy": {
+            "allocataires_base": 5000,
+            "budget_base": 45,
+            "specificites": ("vieillesse", "tourisme", "revenus_eleves")
+        },
+        "Saint-Pierre-et-Miquelon": {
+            "allocataires_base": 3500,
+            "budget_base": 35,
+            "specificites": ("isolement", "vieillesse", "petite_enfance")
+        },
+        "Wallis-et-Futuna": {
+            "allocataires_base": 8000,
+            "budget_base": 55,
+            "specificites": ("traditions", "jeunesse", "isolement")
+        },
+        "Polynésie française": {
+            "allocataires_base": 95000,
+            "budget_base": 320,
+            "specificites": ("isolement", "tourisme", "jeunesse")
+        },
+        "Nouvelle-Calédonie": {
+            "allocataires_base": 105000,
+            "budget_base": 380,
+            "specificites": ("nickel", "vieillesse", "precarite")
+        },
+        # Configuration par défaut pour les autres territoires
+        "default": {
+            "allocataires_base": 50000,
+            "budget_base": 200,
+            "specificites": ("prestations_familiales", "logement", "solidarite")
+        }
+    }
+    
+    # Niveau de croissance démographique et budgétaire de chaque territoire
+    _GROWTH_TIER = {
+        "Mayotte": "high", "Guyane": "high",  # Croissance très forte
+        "La Réunion": "mid", "Polynésie française": "mid"  # Croissance forte
+    }  # Croissance modérée ("low") pour les autres territoires
+    
+    # Taux de croissance annuels par série: très forte / forte / modérée
+    _GROWTH_RATES = {
+        'Nombre_Allocataires': {"high": 0.025, "mid": 0.018, "low": 0.012},
+        'Prestations_Versees': {"high": 0.028, "mid": 0.022, "low": 0.018},
+        'Recettes_Totales': {"high": 0.042, "mid": 0.035, "low": 0.028},
+        'Cotisations_Sociales': {"high": 0.035, "mid": 0.028, "low": 0.022},
+        'Contributions_Etat': {"high": 0.022, "mid": 0.018, "low": 0.015},
+        'Depenses_Totales': {"high": 0.038, "mid": 0.032, "low": 0.026},
+        'Prestations_Familiales': {"high": 0.032, "mid": 0.028, "low": 0.022},
+        'Prestations_Logement': {"high": 0.035, "mid": 0.03, "low": 0.024},
+        'Prestations_Solidarite': {"high": 0.04, "mid": 0.035, "low": 0.028},
+        'Allocations_Familiales': {"high": 0.03, "mid": 0.025, "low": 0.02},
+        'ARS': {"high": 0.032, "mid": 0.028, "low": 0.022},
+        'APL': {"high": 0.036, "mid": 0.032, "low": 0.026},
+        'RSA': {"high": 0.042, "mid": 0.038, "low": 0.03},
+        'Prime_Naissance': {"high": 0.026, "mid": 0.022, "low": 0.018},
+    }
+    
+    # Taux de couverture initial plus faible / modéré / élevé
+    _BASE_COVERAGE = {"high": 0.85, "mid": 0.88, "low": 0.92}
+    
+    # Ratio de gestion initial (0.055 pour les autres territoires)
+    _BASE_MANAGEMENT_RATIO = {
+        # Ratio de gestion initial plus élevé (petits territoires)
+        "Saint-Pierre-et-Miquelon": 0.075, "Wallis-et-Futuna": 0.075,
+        # Ratio de gestion initial modéré
+        "Mayotte": 0.065, "Guyane": 0.065
+    }
+    
+    # Figure d'analyse partagée entre les analyses successives (voir _make_figure)
+    _figure = None
+    
+    # Palette partagée par tous les analyseurs, et couleurs des couches empilées
+    colors = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', '#6A0572',
+              '#AB83A1', '#5CAB7D', '#2A9D8F', '#E76F51', '#264653')
+    _STACK_COLORS = ('#264653', '#2A9D8F', '#E76F51', '#F9A602')
+    
+    # Formats de sauvegarde des données (voir save_financial_data)
+    _OUTPUT_FORMATS = ('csv', 'parquet')
+    
+    def __init__(self, territoire_name, seed=None, interactive=True, output_format='csv'):
         self.territoire = territoire_name
-        self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', '#6A0572', 
-                      '#AB83A1', '#5CAB7D', '#2A9D8F', '#E76F51', '#264653']
-        
+        self.seed = seed
+        self.interactive = interactive
+        if output_format not in self._OUTPUT_FORMATS:
+            raise ValueError(f"Format de sortie inconnu: {output_format!r} "
+                             f"(formats possibles: {', '.join(self._OUTPUT_FORMATS)})")
+        self.output_format = output_format  # 'csv' ou 'parquet'
+        self.rng = np.random.default_rng(seed)
         self.start_year = 2002
         self.end_year = 2025
         
         # Configuration spécifique à chaque territoire DROM-COM
         self.config = self._get_territoire_config()
+        self.tier = self._GROWTH_TIER.get(territoire_name, "low")
+        self._spec_set = frozenset(self.config["specificites"])
+        self._spec_str = ', '.join(self.config["specificites"])
         
     def _get_territoire_config(self):
         """Retourne la configuration spécifique pour chaque CAF DROM-COM"""
-        configs = {
-            "Guadeloupe": {
-                "allocataires_base": 120000,
-                "budget_base": 450,
-                "specificites": ["familles_nombreuses", "precarite", "vieillesse"]
-            },
-            "Martinique": {
-                "allocataires_base": 110000,
-                "budget_base": 420,
-                "specificites": ["vieillesse", "dependance", "handicap"]
-            },
-            "Guyane": {
-                "allocataires_base": 85000,
-                "budget_base": 380,
-                "specificites": ["jeunesse", "familles_nombreuses", "precarite"]
-            },
-            "La Réunion": {
-                "allocataires_base": 220000,
-                "budget_base": 680,
-                "specificites": ["precarite", "emploi", "familles_monoparentales"]
-            },
-            "Mayotte": {
-                "allocataires_base": 65000,
-                "budget_base": 280,
-                "specificites": ["jeunesse", "familles_nombreuses", "precarite_elevee"]
-            },
-            "Saint-Martin": {
-                "allocataires_base": 18000,
-                "budget_base": 85,
-                "specificites": ["tourisme", "petite_enfance", "precarite"]
-            },
-            "Saint-Barthélemy": {
-                "allocataires_base": 5000,
-                "budget_base": 45,
-                "specificites": ["vieillesse", "tourisme", "revenus_eleves"]
-            },
-            "Saint-Pierre-et-Miquelon": {
-                "allocataires_base": 3500,
-                "budget_base": 35,
-                "specificites": ["isolement", "vieillesse", "petite_enfance"]
-            },
-            "Wallis-et-Futuna": {
-                "allocataires_base": 8000,
-                "budget_base": 55,
-                "specificites": ["traditions", "jeunesse", "isolement"]
-            },
-            "Polynésie française": {
-                "allocataires_base": 95000,
-                "budget_base": 320,
-                "specificites": ["isolement", "tourisme", "jeunesse"]
-            },
-            "Nouvelle-Calédonie": {
-                "allocataires_base": 105000,
-                "budget_base": 380,
-                "specificites": ["nickel", "vieillesse", "precarite"]
-            },
-            # Configuration par défaut pour les autres territoires
-            "default": {
-                "allocataires_base": 50000,
-                "budget_base": 200,
-                "specificites": ["prestations_familiales", "logement", "solidarite"]
-            }
-        }
-        
-        return configs.get(self.territoire, configs["default"])
+        return self._CONFIGS.get(self.territoire, self._CONFIGS["default"])
     
     def generate_financial_data(self):
         """Génère des données financières pour la CAF"""
         print(f"🏛️ Génération des données financières pour CAF {self.territoire}...")
         
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données démographiques
-        data['Nombre_Allocataires'] = self._simulate_allocataires(dates)
-        data['Prestations_Versees'] = self._simulate_prestations(dates)
+        if self.seed is None:
+            years, data = self._simulate_financial_array()
+        else:
+            # Données déterministes pour une graine donnée: réutiliser le cache
+            # (tableaux en lecture seule, jamais enveloppés directement)
+            years, data = _cached_financial_array(self.territoire, self.start_year,
+                                                  self.end_year, self.seed)
         
-        # Recettes de la CAF
-        data['Recettes_Totales'] = self._simulate_total_revenue(dates)
-        data['Cotisations_Sociales'] = self._simulate_social_contributions(dates)
-        data['Contributions_Etat'] = self._simulate_state_contributions(dates)
-        data['Autres_Recettes'] = self._simulate_other_revenue(dates)
+        # Seule copie du tableau: la conversion en simple précision, qui garde
+        # l'ordre colonne et que pandas enveloppe sans copie supplémentaire
+        columns = [column for column, *_ in self._SERIES]
+        df = pd.DataFrame(data.astype(np.float32), columns=columns, copy=False)
+        df.insert(0, 'Annee', years.copy())
         
-        # Dépenses de la CAF
-        data['Depenses_Totales'] = self._simulate_total_expenses(dates)
-        data['Prestations_Familiales'] = self._simulate_family_benefits(dates)
-        data['Prestations_Logement'] = self._simulate_housing_benefits(dates)
-        data['Prestations_Solidarite'] = self._simulate_solidarity_benefits(dates)
-        data['Frais_Gestion'] = self._simulate_management_costs(dates)
+        # Effectifs arrondis en int32, à partir des valeurs en double précision
+        for column in self._INT32_COLUMNS:
+            df[column] = np.rint(data[:, self._COLUMN_INDEX[column]]).astype(np.int32)
         
-        # Indicateurs financiers
-        data['Taux_Couverture'] = self._simulate_coverage_rate(dates)
-        data['Ratio_Gestion'] = self._simulate_management_ratio(dates)
-        data['Solde_Compte'] = self._simulate_account_balance(dates)
+        return df
+    
+    def _simulate_financial_array(self):
+        """Simule toutes les séries: renvoie les années et le tableau (années x séries)"""
+        # Créer une base de données annuelle
+        years = np.arange(self.start_year, self.end_year + 1, dtype=np.int32)
         
-        # Prestations spécifiques adaptées aux DROM-COM
-        data['Allocations_Familiales'] = self._simulate_family_allocations(dates)
-        data['ARS'] = self._simulate_ars(dates)
-        data['APL'] = self._simulate_apl(dates)
-        data['RSA'] = self._simulate_rsa(dates)
-        data['Prime_Naissance'] = self._simulate_birth_grant(dates)
+        steps = self._growth_steps(self.start_year, self.end_year)
         
-        df = pd.DataFrame(data)
+        # Tableau pré-alloué en ordre colonne (Fortran): les séries y sont calculées
+        # directement, colonne par colonne comme pandas les stocke
+        data = np.empty((len(years), len(self._SERIES)), dtype=np.float64, order='F')
+        # Bruit gaussien tiré en une seule fois pour toutes les séries, mis à
+        # l'échelle de chaque colonne par diffusion du vecteur des écarts-types
+        noise = 1 + self._SIGMAS * self.rng.standard_normal(data.shape)
+        bases, rates = self._series_parameters()
+        _simulate_all(steps, bases, rates, noise, out=data)
         
         # Ajouter des tendances spécifiques aux CAF DROM-COM
-        self._add_caf_trends(df)
-        
-        return df
-    
-    def _simulate_allocataires(self, dates):
-        """Simule le nombre d'allocataires"""
+        self._add_caf_trends(years, data)
+        
+        return years, data
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _growth_steps(cls, start_year, end_year):
+        """Matrice (années x séries) d'avancement, calculée une fois par période"""
+        years = np.arange(start_year, end_year + 1)
+        # Rang de l'année, ou années écoulées depuis 2010 pour les séries
+        # qui n'évoluent qu'à partir de cette date
+        since_2010 = np.array([column in cls._SINCE_2010 for column, *_ in cls._SERIES])
+        steps = np.where(since_2010, np.maximum(years - 2010, 0)[:, None],
+                         np.arange(len(years))[:, None])
+        steps = np.asfortranarray(steps, dtype=np.float64)
+        steps.flags.writeable = False  # Partagée entre tous les analyseurs
+        return steps
+    
+    def _series_parameters(self):
+        """Rassemble les paramètres (base, taux) de chaque série en vecteurs"""
+        params = np.array([getattr(self, method)() for _, method, _ in self._SERIES])
+        return params[:, 0], params[:, 1]
+    
+    def _params_allocataires(self):
+        """Base et taux de croissance du nombre d'allocataires"""
         base_allocataires = self.config["allocataires_base"]
         
-        allocataires = []
-        for i, date in enumerate(dates):
-            # Croissance démographique spécifique aux DROM-COM
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth_rate = 0.025  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth_rate = 0.018  # Croissance forte
-            else:
-                growth_rate = 0.012  # Croissance modérée
-            
-            growth = 1 + growth_rate * i
-            allocataires.append(base_allocataires * growth)
-        
-        return allocataires
-    
-    def _simulate_prestations(self, dates):
-        """Simule le montant total des prestations versées"""
+        # Croissance démographique spécifique aux DROM-COM
+        growth_rate = self._GROWTH_RATES['Nombre_Allocataires'][self.tier]
+        return base_allocataires, growth_rate
+    
+    def _params_prestations(self):
+        """Base et taux de croissance du montant total des prestations versées"""
         base_prestations = self.config["budget_base"] * 0.85  # 85% du budget en prestations
         
-        prestations = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.028 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.022 * i  # Croissance forte
-            else:
-                growth = 1 + 0.018 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.07)
-            prestations.append(base_prestations * growth * noise)
-        
-        return prestations
-    
-    def _simulate_total_revenue(self, dates):
-        """Simule les recettes totales de la CAF"""
+        growth_rate = self._GROWTH_RATES['Prestations_Versees'][self.tier]
+        return base_prestations, growth_rate
+    
+    def _params_total_revenue(self):
+        """Base et taux de croissance des recettes totales de la CAF"""
         base_revenue = self.config["budget_base"]
         
-        revenue = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth_rate = 0.042  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth_rate = 0.035  # Croissance forte
-            else:
-                growth_rate = 0.028  # Croissance modérée
-                
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.08)
-            revenue.append(base_revenue * growth * noise)
-        
-        return revenue
-    
-    def _simulate_social_contributions(self, dates):
-        """Simule les cotisations sociales"""
+        growth_rate = self._GROWTH_RATES['Recettes_Totales'][self.tier]
+        return base_revenue, growth_rate
+    
+    def _params_social_contributions(self):
+        """Base et taux de croissance des cotisations sociales"""
         base_contributions = self.config["budget_base"] * 0.65
         
-        contributions = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.035 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.028 * i  # Croissance forte
-            else:
-                growth = 1 + 0.022 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.06)
-            contributions.append(base_contributions * growth * noise)
-        
-        return contributions
-    
-    def _simulate_state_contributions(self, dates):
-        """Simule les contributions de l'État (plus importantes en DROM-COM)"""
+        growth_rate = self._GROWTH_RATES['Cotisations_Sociales'][self.tier]
+        return base_contributions, growth_rate
+    
+    def _params_state_contributions(self):
+        """Base et taux de croissance des contributions de l'État (plus importantes en DROM-COM)"""
         base_state = self.config["budget_base"] * 0.30  # Part plus importante
         
-        state_contributions = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Augmentation plus forte des contributions pour les DROM-COM
-            if year >= 2010:
-                if self.territoire in ["Mayotte", "Guyane"]:
-                    increase = 1 + 0.022 * (year - 2010)  # Très forte augmentation
-                elif self.territoire in ["La Réunion", "Polynésie française"]:
-                    increase = 1 + 0.018 * (year - 2010)  # Forte augmentation
-                else:
-                    increase = 1 + 0.015 * (year - 2010)  # Augmentation modérée
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.05)
-            state_contributions.append(base_state * increase * noise)
-        
-        return state_contributions
-    
-    def _simulate_other_revenue(self, dates):
-        """Simule les autres recettes"""
+        # Augmentation plus forte des contributions pour les DROM-COM à partir de 2010
+        increase_rate = self._GROWTH_RATES['Contributions_Etat'][self.tier]
+        return base_state, increase_rate
+    
+    def _params_other_revenue(self):
+        """Base et taux de croissance des autres recettes"""
         base_other = self.config["budget_base"] * 0.05
         
-        other_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.025 * i
-            noise = np.random.normal(1, 0.10)
-            other_revenue.append(base_other * growth * noise)
-        
-        return other_revenue
+        return base_other, 0.025
     
-    def _simulate_total_expenses(self, dates):
-        """Simule les dépenses totales"""
+    def _params_total_expenses(self):
+        """Base et taux de croissance des dépenses totales"""
         base_expenses = self.config["budget_base"] * 0.95
         
-        expenses = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.038 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.032 * i  # Croissance forte
-            else:
-                growth = 1 + 0.026 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.07)
-            expenses.append(base_expenses * growth * noise)
-        
-        return expenses
-    
-    def _simulate_family_benefits(self, dates):
-        """Simule les prestations familiales"""
+        growth_rate = self._GROWTH_RATES['Depenses_Totales'][self.tier]
+        return base_expenses, growth_rate
+    
+    def _params_family_benefits(self):
+        """Base et taux de croissance des prestations familiales"""
         base_family = self.config["budget_base"] * 0.45
         
         # Ajustement selon les spécificités
-        multiplier = 1.4 if "familles_nombreuses" in self.config["specificites"] else 1.0
-        
-        family_benefits = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.032 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.028 * i  # Croissance forte
-            else:
-                growth = 1 + 0.022 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.06)
-            family_benefits.append(base_family * growth * multiplier * noise)
-        
-        return family_benefits
-    
-    def _simulate_housing_benefits(self, dates):
-        """Simule les prestations logement"""
+        multiplier = 1.4 if "familles_nombreuses" in self._spec_set else 1.0
+        
+        growth_rate = self._GROWTH_RATES['Prestations_Familiales'][self.tier]
+        return base_family * multiplier, growth_rate
+    
+    def _params_housing_benefits(self):
+        """Base et taux de croissance des prestations logement"""
         base_housing = self.config["budget_base"] * 0.25
         
-        housing_benefits = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.035 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.03 * i  # Croissance forte
-            else:
-                growth = 1 + 0.024 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.08)
-            housing_benefits.append(base_housing * growth * noise)
-        
-        return housing_benefits
-    
-    def _simulate_solidarity_benefits(self, dates):
-        """Simule les prestations de solidarité"""
+        growth_rate = self._GROWTH_RATES['Prestations_Logement'][self.tier]
+        return base_housing, growth_rate
+    
+    def _params_solidarity_benefits(self):
+        """Base et taux de croissance des prestations de solidarité"""
         base_solidarity = self.config["budget_base"] * 0.20
         
         # Ajustement selon les spécificités
-        multiplier = 1.5 if "precarite" in self.config["specificites"] else 1.0
-        
-        solidarity_benefits = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.04 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.035 * i  # Croissance forte
-            else:
-                growth = 1 + 0.028 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.09)
-            solidarity_benefits.append(base_solidarity * growth * multiplier * noise)
-        
-        return solidarity_benefits
-    
-    def _simulate_management_costs(self, dates):
-        """Simule les frais de gestion"""
+        multiplier = 1.5 if "precarite" in self._spec_set else 1.0
+        
+        growth_rate = self._GROWTH_RATES['Prestations_Solidarite'][self.tier]
+        return base_solidarity * multiplier, growth_rate
+    
+    def _params_management_costs(self):
+        """Base et taux de croissance des frais de gestion"""
         base_management = self.config["budget_base"] * 0.05
         
-        management_costs = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.02 * i
-            noise = np.random.normal(1, 0.04)
-            management_costs.append(base_management * growth * noise)
-        
-        return management_costs
-    
-    def _simulate_coverage_rate(self, dates):
-        """Simule le taux de couverture"""
-        rates = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                base_rate = 0.85  # Taux de couverture initial plus faible
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                base_rate = 0.88  # Taux de couverture initial modéré
-            else:
-                base_rate = 0.92  # Taux de couverture initial élevé
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 + 0.005 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.03)
-            rates.append(base_rate * improvement * noise)
-        
-        return rates
-    
-    def _simulate_management_ratio(self, dates):
-        """Simule le ratio de gestion"""
-        ratios = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Saint-Pierre-et-Miquelon", "Wallis-et-Futuna"]:
-                base_ratio = 0.075  # Ratio de gestion initial plus élevé (petits territoires)
-            elif self.territoire in ["Mayotte", "Guyane"]:
-                base_ratio = 0.065  # Ratio de gestion initial modéré
-            else:
-                base_ratio = 0.055  # Ratio de gestion initial faible
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 - 0.003 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.02)
-            ratios.append(base_ratio * improvement * noise)
-        
-        return ratios
-    
-    def _simulate_account_balance(self, dates):
-        """Simule le solde de compte"""
-        balances = []
-        for i, date in enumerate(dates):
-            base_balance = self.config["budget_base"] * 0.03
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 + 0.01 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.15)
-            balances.append(base_balance * improvement * noise)
-        
-        return balances
-    
-    def _simulate_family_allocations(self, dates):
-        """Simule les allocations familiales"""
+        return base_management, 0.02
+    
+    def _params_coverage_rate(self):
+        """Base et taux de croissance du taux de couverture (amélioration à partir de 2010)"""
+        base_rate = self._BASE_COVERAGE[self.tier]
+        
+        return base_rate, 0.005
+    
+    def _params_management_ratio(self):
+        """Base et taux de croissance du ratio de gestion (amélioration à partir de 2010)"""
+        base_ratio = self._BASE_MANAGEMENT_RATIO.get(self.territoire, 0.055)
+        
+        return base_ratio, -0.003
+    
+    def _params_account_balance(self):
+        """Base et taux de croissance du solde de compte (amélioration à partir de 2010)"""
+        base_balance = self.config["budget_base"] * 0.03
+        
+        return base_balance, 0.01
+    
+    def _params_family_allocations(self):
+        """Base et taux de croissance des allocations familiales"""
         base_allocation = self.config["budget_base"] * 0.25
         
         # Ajustement selon les spécificités
-        multiplier = 1.4 if "familles_nombreuses" in self.config["specificites"] else 1.0
-        
-        allocations = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.03 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.025 * i  # Croissance forte
-            else:
-                growth = 1 + 0.02 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.06)
-            allocations.append(base_allocation * growth * multiplier * noise)
-        
-        return allocations
-    
-    def _simulate_ars(self, dates):
-        """Simule l'Allocation de Rentrée Scolaire"""
+        multiplier = 1.4 if "familles_nombreuses" in self._spec_set else 1.0
+        
+        growth_rate = self._GROWTH_RATES['Allocations_Familiales'][self.tier]
+        return base_allocation * multiplier, growth_rate
+    
+    def _params_ars(self):
+        """Base et taux de croissance de l'Allocation de Rentrée Scolaire"""
         base_ars = self.config["budget_base"] * 0.08
         
         # Ajustement selon les spécificités
-        multiplier = 1.3 if "jeunesse" in self.config["specificites"] else 1.0
-        
-        ars = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.032 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.028 * i  # Croissance forte
-            else:
-                growth = 1 + 0.022 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.07)
-            ars.append(base_ars * growth * multiplier * noise)
-        
-        return ars
-    
-    def _simulate_apl(self, dates):
-        """Simule les Aides Personnalisées au Logement"""
+        multiplier = 1.3 if "jeunesse" in self._spec_set else 1.0
+        
+        growth_rate = self._GROWTH_RATES['ARS'][self.tier]
+        return base_ars * multiplier, growth_rate
+    
+    def _params_apl(self):
+        """Base et taux de croissance des Aides Personnalisées au Logement"""
         base_apl = self.config["budget_base"] * 0.20
         
-        apl = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.036 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.032 * i  # Croissance forte
-            else:
-                growth = 1 + 0.026 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.08)
-            apl.append(base_apl * growth * noise)
-        
-        return apl
-    
-    def _simulate_rsa(self, dates):
-        """Simule le Revenu de Solidarité Active"""
+        growth_rate = self._GROWTH_RATES['APL'][self.tier]
+        return base_apl, growth_rate
+    
+    def _params_rsa(self):
+        """Base et taux de croissance du Revenu de Solidarité Active"""
         base_rsa = self.config["budget_base"] * 0.15
         
         # Ajustement selon les spécificités
-        multiplier = 1.6 if "precarite" in self.config["specificites"] else 1.0
-        
-        rsa = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.042 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.038 * i  # Croissance forte
-            else:
-                growth = 1 + 0.03 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.09)
-            rsa.append(base_rsa * growth * multiplier * noise)
-        
-        return rsa
-    
-    def _simulate_birth_grant(self, dates):
-        """Simule la prime à la naissance"""
+        multiplier = 1.6 if "precarite" in self._spec_set else 1.0
+        
+        growth_rate = self._GROWTH_RATES['RSA'][self.tier]
+        return base_rsa * multiplier, growth_rate
+    
+    def _params_birth_grant(self):
+        """Base et taux de croissance de la prime à la naissance"""
         base_birth = self.config["budget_base"] * 0.04
         
         # Ajustement selon les spécificités
-        multiplier = 1.5 if "jeunesse" in self.config["specificites"] else 1.0
-        
-        birth_grants = []
-        for i, date in enumerate(dates):
-            if self.territoire in ["Mayotte", "Guyane"]:
-                growth = 1 + 0.026 * i  # Croissance très forte
-            elif self.territoire in ["La Réunion", "Polynésie française"]:
-                growth = 1 + 0.022 * i  # Croissance forte
-            else:
-                growth = 1 + 0.018 * i  # Croissance modérée
-                
-            noise = np.random.normal(1, 0.10)
-            birth_grants.append(base_birth * growth * multiplier * noise)
-        
-        return birth_grants
-    
-    def _add_caf_trends(self, df):
+        multiplier = 1.5 if "jeunesse" in self._spec_set else 1.0
+        
+        growth_rate = self._GROWTH_RATES['Prime_Naissance'][self.tier]
+        return base_birth * multiplier, growth_rate
+    
+    def _add_caf_trends(self, years, data):
         """Ajoute des tendances réalistes adaptées aux CAF DROM-COM"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Développement initial (2002-2005)
-            if 2002 <= year <= 2005:
-                df.loc[i, 'Contributions_Etat'] *= 1.1
-                df.loc[i, 'Prestations_Familiales'] *= 1.15
-            
-            # Réforme des prestations (2006-2010)
-            if 2006 <= year <= 2010:
-                df.loc[i, 'RSA'] *= 1.25  # Mise en place du RSA
-                df.loc[i, 'Prestations_Solidarite'] *= 1.3
-            
-            # Impact de la crise financière (2008-2009)
-            if 2008 <= year <= 2009:
-                df.loc[i, 'Cotisations_Sociales'] *= 0.92
-                df.loc[i, 'RSA'] *= 1.15
-            
-            # Renforcement des politiques sociales (2011-2015)
-            elif 2011 <= year <= 2015:
-                df.loc[i, 'Contributions_Etat'] *= 1.12
-                df.loc[i, 'Allocations_Familiales'] *= 1.08
-            
-            # Mouvements sociaux de 2017 et renforcement des aides
-            if year == 2017:
-                df.loc[i, 'Contributions_Etat'] *= 1.18
-                df.loc[i, 'RSA'] *= 1.10
-            
-            # Impact de la crise COVID-19 (2020-2021)
-            if 2020 <= year <= 2021:
-                if year == 2020:
-                    df.loc[i, 'Cotisations_Sociales'] *= 0.85
-                    df.loc[i, 'Contributions_Etat'] *= 1.25
-                    df.loc[i, 'RSA'] *= 1.35
-            
-            # Plan de relance post-COVID (2022-2025)
-            if year >= 2022:
-                df.loc[i, 'Contributions_Etat'] *= 1.08
-                df.loc[i, 'Prestations_Logement'] *= 1.12
-                df.loc[i, 'ARS'] *= 1.10
-    
-    def create_financial_analysis(self, df):
+        # Chaque année est rattachée à son régime par recherche dichotomique,
+        # puis la ligne de facteurs correspondante est appliquée en une fois
+        edges, regimes = self._trend_regimes()
+        data *= regimes[np.searchsorted(edges, years, side='right')]
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _trend_regimes(cls):
+        """Bornes des régimes de tendances et matrice (régimes x séries) des facteurs"""
+        # Une borne à chaque début de période et au lendemain de chaque fin:
+        # entre deux bornes consécutives, les facteurs sont constants
+        edges = np.array(sorted({first for first, _, _ in cls._TRENDS}
+                                | {last + 1 for _, last, _ in cls._TRENDS if last != np.inf}))
+        regimes = np.ones((len(edges) + 1, len(cls._SERIES)))
+        for first, last, rule in cls._TRENDS:
+            # Le régime i commence à edges[i - 1] (le régime 0 précède toute période)
+            active = np.r_[False, (edges >= first) & (edges <= last)]
+            for column, factor in rule.items():
+                regimes[active, cls._COLUMN_INDEX[column]] *= factor
+        edges.flags.writeable = regimes.flags.writeable = False
+        return edges, regimes
+    
+    def save_financial_data(self, df):
+        """Sauvegarde les données financières et renvoie le nom du fichier"""
+        output_file = f'CAF_{self.territoire}_financial_data_{self.start_year}_{self.end_year}'
+        if self.output_format == 'parquet':
+            # Écriture colonne par colonne en C++ (Arrow), fichier compressé
+            output_file += '.parquet'
+            df.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
+        else:
+            # Montants au centime, ratios à 4 décimales pour conserver leur précision
+            output_file += '.csv'
+            decimals = {column: 4 if column in self._RATIO_COLUMNS else 2 for column in df.columns}
+            df.round(decimals).to_csv(output_file, index=False, lineterminator='\n')
+        return output_file
+    
+    def create_financial_analysis(self, df, verbose=True):
         """Crée une analyse complète des finances de la CAF"""
-        plt.style.use('seaborn-v0_8')
-        fig = plt.figure(figsize=(20, 24))
+        plt = _pyplot()
+        fig, (ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8) = self._make_figure()
         
         # 1. Évolution des recettes et dépenses
-        ax1 = plt.subplot(4, 2, 1)
         self._plot_revenue_expenses(df, ax1)
         
         # 2. Structure des recettes
-        ax2 = plt.subplot(4, 2, 2)
         self._plot_revenue_structure(df, ax2)
         
         # 3. Structure des dépenses
-        ax3 = plt.subplot(4, 2, 3)
         self._plot_expenses_structure(df, ax3)
         
         # 4. Prestations versées
-        ax4 = plt.subplot(4, 2, 4)
         self._plot_benefits(df, ax4)
         
         # 5. Indicateurs de performance
-        ax5 = plt.subplot(4, 2, 5)
         self._plot_performance_indicators(df, ax5)
         
         # 6. Évolution des allocataires
-        ax6 = plt.subplot(4, 2, 6)
         self._plot_allocataires(df, ax6)
         
         # 7. Détail des prestations familiales
-        ax7 = plt.subplot(4, 2, 7)
         self._plot_family_benefits(df, ax7)
         
         # 8. Évolution du solde
-        ax8 = plt.subplot(4, 2, 8)
         self._plot_balance(df, ax8)
         
-        plt.suptitle(f'Analyse des Comptes de CAF {self.territoire} ({self.start_year}-{self.end_year})', 
+        fig.suptitle(f'Analyse des Comptes de CAF {self.territoire} ({self.start_year}-{self.end_year})', 
                     fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(f'CAF_{self.territoire}_financial_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        # Générer les insights
-        self._generate_financial_insights(df)
+        fig.tight_layout()
+        fig.savefig(f'CAF_{self.territoire}_financial_analysis.png', dpi=150, bbox_inches='tight')
+        if self.interactive:
+            plt.show()
+            # Sans réutilisation possible, libérer la figure retenue par pyplot
+            self.close_figure()
+        
+        # Générer les insights (rapport omis en mode silencieux)
+        if verbose:
+            self._generate_financial_insights(df)
+    
+    @classmethod
+    def _make_figure(cls):
+        """Renvoie la figure 4x2 partagée, créée au premier appel puis vidée et réutilisée"""
+        plt = _pyplot()
+        if cls._figure is None or not plt.fignum_exists(cls._figure[0].number):
+            fig, axes = plt.subplots(4, 2, figsize=(20, 24))
+            cls._figure = (fig, list(axes.flat))
+        else:
+            fig, axes = cls._figure
+            # Retirer les axes secondaires (twinx) du tracé précédent
+            for ax in fig.axes:
+                if ax not in axes:
+                    ax.remove()
+            for ax in axes:
+                ax.clear()
+        return cls._figure
+    
+    @classmethod
+    def close_figure(cls):
+        """Ferme la figure partagée (à appeler en fin de traitement par lots)"""
+        if cls._figure is not None:
+            _pyplot().close(cls._figure[0])
+            cls._figure = None
     
     def _plot_revenue_expenses(self, df, ax):
         """Plot de l'évolution des recettes et dépenses"""
         ax.plot(df['Annee'], df['Recettes_Totales'], label='Recettes Totales', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+               linewidth=2, rasterized=True, color='#2A9D8F', alpha=0.8)
         ax.plot(df['Annee'], df['Depenses_Totales'], label='Dépenses Totales', 
-               linewidth=2, color='#E76F51', alpha=0.8)
+               linewidth=2, rasterized=True, color='#E76F51', alpha=0.8)
         
-        ax.set_title('Évolution des Recettes et Dépenses (M€)', 
-                    fontsize=12, fontweight='bold')
+        ax.set_title('Évolution des Recettes et Dépenses (M€)')
         ax.set_ylabel('Montants (M€)')
         ax.legend()
-        ax.grid(True, alpha=0.3)
+    
+    def _plot_stacked_bars(self, df, ax, categories, labels, width=0.8):
+        """Barres empilées, avec les bases de chaque couche précalculées en une fois"""
+        years = df['Annee'].to_numpy()
+        heights = df[categories].to_numpy()
+        bottoms = np.zeros_like(heights)
+        np.cumsum(heights[:, :-1], axis=1, out=bottoms[:, 1:])
+        
+        for i in range(len(categories)):
+            ax.bar(years, heights[:, i], width, label=labels[i], bottom=bottoms[:, i], color=self._STACK_COLORS[i],
+                   rasterized=True)
     
     def _plot_revenue_structure(self, df, ax):
         """Plot de la structure des recettes"""
-        years = df['Annee']
-        width = 0.8
-        
-        bottom = np.zeros(len(years))
         categories = ['Cotisations_Sociales', 'Contributions_Etat', 'Autres_Recettes']
-        colors = ['#264653', '#2A9D8F', '#E76F51']
         labels = ['Cotisations Sociales', 'Contributions État', 'Autres Recettes']
         
-        for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
-            bottom += df[category]
+        self._plot_stacked_bars(df, ax, categories, labels)
         
-        ax.set_title('Structure des Recettes (M€)', fontsize=12, fontweight='bold')
+        ax.set_title('Structure des Recettes (M€)')
         ax.set_ylabel('Montants (M€)')
         ax.legend()
-        ax.grid(True, alpha=0.3, axis='y')
     
     def _plot_expenses_structure(self, df, ax):
         """Plot de la structure des dépenses"""
-        years = df['Annee']
-        width = 0.8
-        
-        bottom = np.zeros(len(years))
         categories = ['Prestations_Familiales', 'Prestations_Logement', 
                      'Prestations_Solidarite', 'Frais_Gestion']
-        colors = ['#264653', '#2A9D8F', '#E76F51', '#F9A602']
         labels = ['Prestations Familiales', 'Prestations Logement', 
                  'Prestations Solidarité', 'Frais de Gestion']
         
-        for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
-            bottom += df[category]
+        self._plot_stacked_bars(df, ax, categories, labels)
         
-        ax.set_title('Structure des Dépenses (M€)', fontsize=12, fontweight='bold')
+        ax.set_title('Structure des Dépenses (M€)')
         ax.set_ylabel('Montants (M€)')
         ax.legend()
-        ax.grid(True, alpha=0.3, axis='y')
     
     def _plot_benefits(self, df, ax):
         """Plot des prestations versées"""
         ax.plot(df['Annee'], df['Allocations_Familiales'], label='Allocations Familiales', 
-               linewidth=2, color='#264653', alpha=0.8)
+               linewidth=2, rasterized=True, color='#264653', alpha=0.8)
         ax.plot(df['Annee'], df['ARS'], label='ARS', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+               linewidth=2, rasterized=True, color='#2A9D8F', alpha=0.8)
         ax.plot(df['Annee'], df['APL'], label='APL', 
-               linewidth=2, color='#E76F51', alpha=0.8)
+               linewidth=2, rasterized=True, color='#E76F51', alpha=0.8)
         ax.plot(df['Annee'], df['RSA'], label='RSA', 
-               linewidth=2, color='#F9A602', alpha=0.8)
+               linewidth=2, rasterized=True, color='#F9A602', alpha=0.8)
         ax.plot(df['Annee'], df['Prime_Naissance'], label='Prime Naissance', 
-               linewidth=2, color='#6A0572', alpha=0.8)
+               linewidth=2, rasterized=True, color='#6A0572', alpha=0.8)
         
-        ax.set_title('Détail des Prestations Versées (M€)', fontsize=12, fontweight='bold')
+        ax.set_title('Détail des Prestations Versées (M€)')
         ax.set_ylabel('Montants (M€)')
         ax.legend()
-        ax.grid(True, alpha=0.3)
     
     def _plot_performance_indicators(self, df, ax):
         """Plot des indicateurs de performance"""
         # Taux de couverture
         ax.plot(df['Annee'], df['Taux_Couverture'], label='Taux de Couverture', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
+               linewidth=2, rasterized=True, color='#2A9D8F', alpha=0.8)
         
-        ax.set_title('Indicateurs de Performance', fontsize=12, fontweight='bold')
+        ax.set_title('Indicateurs de Performance')
         ax.set_ylabel('Taux de Couverture', color='#2A9D8F')
         ax.tick_params(axis='y', labelcolor='#2A9D8F')
-        ax.grid(True, alpha=0.3)
         
         # Ratio de gestion en second axe
         ax2 = ax.twinx()
         ax2.plot(df['Annee'], df['Ratio_Gestion'], label='Ratio de Gestion', 
-                linewidth=2, color='#E76F51', alpha=0.8)
+                linewidth=2, rasterized=True, color='#E76F51', alpha=0.8)
         ax2.set_ylabel('Ratio de Gestion', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -680,17 +650,16 @@ class CAF_DROMCOMAnalyzer:
     def _plot_allocataires(self, df, ax):
         """Plot de l'évolution du nombre d'allocataires"""
         ax.plot(df['Annee'], df['Nombre_Allocataires'], label='Nombre d\'Allocataires', 
-               linewidth=2, color='#264653', alpha=0.8)
+               linewidth=2, rasterized=True, color='#264653', alpha=0.8)
         
-        ax.set_title('Évolution du Nombre d\'Allocataires', fontsize=12, fontweight='bold')
+        ax.set_title('Évolution du Nombre d\'Allocataires')
         ax.set_ylabel('Nombre d\'Allocataires', color='#264653')
         ax.tick_params(axis='y', labelcolor='#264653')
-        ax.grid(True, alpha=0.3)
         
         # Prestations versées en second axe
         ax2 = ax.twinx()
         ax2.plot(df['Annee'], df['Prestations_Versees'], label='Prestations Versées (M€)', 
-                linewidth=2, color='#E76F51', alpha=0.8)
+                linewidth=2, rasterized=True, color='#E76F51', alpha=0.8)
         ax2.set_ylabel('Prestations Versées (M€)', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -701,116 +670,160 @@ class CAF_DROMCOMAnalyzer:
     
     def _plot_family_benefits(self, df, ax):
         """Plot du détail des prestations familiales"""
-        years = df['Annee']
-        width = 0.8
-        
-        bottom = np.zeros(len(years))
         categories = ['Allocations_Familiales', 'ARS', 'Prime_Naissance']
-        colors = ['#264653', '#2A9D8F', '#E76F51']
         labels = ['Allocations Familiales', 'ARS', 'Prime Naissance']
         
-        for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
-            bottom += df[category]
+        self._plot_stacked_bars(df, ax, categories, labels)
         
-        ax.set_title('Détail des Prestations Familiales (M€)', fontsize=12, fontweight='bold')
+        ax.set_title('Détail des Prestations Familiales (M€)')
         ax.set_ylabel('Montants (M€)')
         ax.legend()
-        ax.grid(True, alpha=0.3, axis='y')
     
     def _plot_balance(self, df, ax):
         """Plot de l'évolution du solde"""
         ax.bar(df['Annee'], df['Solde_Compte'], label='Solde (M€)', 
-              color='#2A9D8F', alpha=0.7)
+              color='#2A9D8F', alpha=0.7, rasterized=True)
         
-        ax.set_title('Évolution du Solde de Compte', fontsize=12, fontweight='bold')
+        ax.set_title('Évolution du Solde de Compte')
         ax.set_ylabel('Solde (M€)', color='#2A9D8F')
         ax.tick_params(axis='y', labelcolor='#2A9D8F')
-        ax.grid(True, alpha=0.3, axis='y')
         
-        # Ligne de tendance
-        z = np.polyfit(df['Annee'], df['Solde_Compte'], 1)
-        p = np.poly1d(z)
-        ax.plot(df['Annee'], p(df['Annee']), "r--", alpha=0.8)
+        # Ligne de tendance (moindres carrés de degré 1, forme fermée)
+        x = df['Annee'].to_numpy()
+        y = df['Solde_Compte'].to_numpy()
+        xm, ym = x.mean(), y.mean()
+        slope = ((x - xm) * (y - ym)).sum() / ((x - xm) ** 2).sum()
+        intercept = ym - slope * xm
+        ax.plot(x, slope * x + intercept, "r--", alpha=0.8, rasterized=True)
     
     def _generate_financial_insights(self, df):
         """Génère des insights analytiques adaptés aux CAF DROM-COM"""
-        print(f"🏛️ INSIGHTS ANALYTIQUES - CAF {self.territoire}")
-        print("=" * 60)
+        # Rapport construit en mémoire puis écrit en une seule fois
+        lines = []
+        lines.append(f"🏛️ INSIGHTS ANALYTIQUES - CAF {self.territoire}")
+        lines.append("=" * 60)
+        
+        # Colonnes utiles en vues NumPy, sans passer par des Series intermédiaires
+        rec, dep, sol, alloc, cot, etat, prest, cov, gest = (
+            df[c].to_numpy() for c in ['Recettes_Totales', 'Depenses_Totales', 'Solde_Compte',
+                                       'Nombre_Allocataires', 'Cotisations_Sociales',
+                                       'Contributions_Etat', 'Prestations_Versees',
+                                       'Taux_Couverture', 'Ratio_Gestion'])
         
         # 1. Statistiques de base
-        print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_revenue = df['Recettes_Totales'].mean()
-        avg_expenses = df['Depenses_Totales'].mean()
-        avg_balance = df['Solde_Compte'].mean()
-        avg_allocataires = df['Nombre_Allocataires'].mean()
+        lines.append("\n1. 📈 STATISTIQUES GÉNÉRALES:")
+        avg_revenue = rec.mean()
+        avg_expenses = dep.mean()
+        avg_balance = sol.mean()
+        avg_allocataires = alloc.mean()
         
-        print(f"Recettes moyennes annuelles: {avg_revenue:.2f} M€")
-        print(f"Dépenses moyennes annuelles: {avg_expenses:.2f} M€")
-        print(f"Solde moyen annuel: {avg_balance:.2f} M€")
-        print(f"Nombre moyen d'allocataires: {avg_allocataires:.0f}")
+        lines.append(f"Recettes moyennes annuelles: {avg_revenue:.2f} M€")
+        lines.append(f"Dépenses moyennes annuelles: {avg_expenses:.2f} M€")
+        lines.append(f"Solde moyen annuel: {avg_balance:.2f} M€")
+        lines.append(f"Nombre moyen d'allocataires: {avg_allocataires:.0f}")
         
         # 2. Croissance
-        print("\n2. 📊 TAUX DE CROISSANCE:")
-        revenue_growth = ((df['Recettes_Totales'].iloc[-1] / 
-                          df['Recettes_Totales'].iloc[0]) - 1) * 100
-        allocataires_growth = ((df['Nombre_Allocataires'].iloc[-1] / 
-                               df['Nombre_Allocataires'].iloc[0]) - 1) * 100
+        lines.append("\n2. 📊 TAUX DE CROISSANCE:")
+        revenue_growth = (rec[-1] / rec[0] - 1) * 100
+        allocataires_growth = (alloc[-1] / alloc[0] - 1) * 100
         
-        print(f"Croissance des recettes ({self.start_year}-{self.end_year}): {revenue_growth:.1f}%")
-        print(f"Croissance du nombre d'allocataires ({self.start_year}-{self.end_year}): {allocataires_growth:.1f}%")
+        lines.append(f"Croissance des recettes ({self.start_year}-{self.end_year}): {revenue_growth:.1f}%")
+        lines.append(f"Croissance du nombre d'allocataires ({self.start_year}-{self.end_year}): {allocataires_growth:.1f}%")
         
         # 3. Structure financière
-        print("\n3. 📋 STRUCTURE FINANCIÈRE:")
-        cotisations_share = (df['Cotisations_Sociales'].mean() / df['Recettes_Totales'].mean()) * 100
-        etat_share = (df['Contributions_Etat'].mean() / df['Recettes_Totales'].mean()) * 100
-        prestations_share = (df['Prestations_Versees'].mean() / df['Depenses_Totales'].mean()) * 100
+        lines.append("\n3. 📋 STRUCTURE FINANCIÈRE:")
+        cotisations_share = (cot.mean() / avg_revenue) * 100
+        etat_share = (etat.mean() / avg_revenue) * 100
+        prestations_share = (prest.mean() / avg_expenses) * 100
         
-        print(f"Part des cotisations sociales dans les recettes: {cotisations_share:.1f}%")
-        print(f"Part des contributions de l'État dans les recettes: {etat_share:.1f}%")
-        print(f"Part des prestations dans les dépenses: {prestations_share:.1f}%")
+        lines.append(f"Part des cotisations sociales dans les recettes: {cotisations_share:.1f}%")
+        lines.append(f"Part des contributions de l'État dans les recettes: {etat_share:.1f}%")
+        lines.append(f"Part des prestations dans les dépenses: {prestations_share:.1f}%")
         
         # 4. Performance
-        print("\n4. 🎯 PERFORMANCE:")
-        avg_coverage = df['Taux_Couverture'].mean() * 100
-        avg_management_ratio = df['Ratio_Gestion'].mean() * 100
-        last_balance = df['Solde_Compte'].iloc[-1]
+        lines.append("\n4. 🎯 PERFORMANCE:")
+        avg_coverage = cov.mean() * 100
+        avg_management_ratio = gest.mean() * 100
+        last_balance = sol[-1]
         
-        print(f"Taux de couverture moyen: {avg_coverage:.1f}%")
-        print(f"Ratio de gestion moyen: {avg_management_ratio:.1f}%")
-        print(f"Solde final: {last_balance:.2f} M€")
+        lines.append(f"Taux de couverture moyen: {avg_coverage:.1f}%")
+        lines.append(f"Ratio de gestion moyen: {avg_management_ratio:.1f}%")
+        lines.append(f"Solde final: {last_balance:.2f} M€")
         
         # 5. Spécificités du territoire
-        print(f"\n5. 🌟 SPÉCIFICITÉS DE {self.territoire.upper()}:")
-        print(f"Spécialités: {', '.join(self.config['specificites'])}")
+        lines.append(f"\n5. 🌟 SPÉCIFICITÉS DE {self.territoire.upper()}:")
+        lines.append(f"Spécialités: {self._spec_str}")
         
         # 6. Événements marquants
-        print("\n6. 📅 ÉVÉNEMENTS MARQUANTS:")
-        print("• 2002-2005: Développement initial des services CAF")
-        print("• 2006-2010: Réforme des prestations et mise en place du RSA")
-        print("• 2008-2009: Impact de la crise financière sur les cotisations")
-        print("• 2011-2015: Renforcement des politiques sociales")
-        print("• 2017: Mouvements sociaux et renforcement des aides")
-        print("• 2020-2021: Crise COVID-19 et plans de soutien exceptionnels")
-        print("• 2022-2025: Plan de relance post-COVID")
+        lines.append("\n6. 📅 ÉVÉNEMENTS MARQUANTS:")
+        lines.append("• 2002-2005: Développement initial des services CAF")
+        lines.append("• 2006-2010: Réforme des prestations et mise en place du RSA")
+        lines.append("• 2008-2009: Impact de la crise financière sur les cotisations")
+        lines.append("• 2011-2015: Renforcement des politiques sociales")
+        lines.append("• 2017: Mouvements sociaux et renforcement des aides")
+        lines.append("• 2020-2021: Crise COVID-19 et plans de soutien exceptionnels")
+        lines.append("• 2022-2025: Plan de relance post-COVID")
         
         # 7. Recommandations
-        print("\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:")
-        if "precarite" in self.config["specificites"]:
-            print("• Renforcer les dispositifs de lutte contre la précarité")
-            print("• Développer les accompagnements vers l'emploi")
-        if "familles_nombreuses" in self.config["specificites"]:
-            print("• Adapter les prestations aux spécificités des familles nombreuses")
-            print("• Développer les services de soutien à la parentalité")
-        if "jeunesse" in self.config["specificites"]:
-            print("• Renforcer les aides à l'éducation et la formation")
-            print("• Développer les programmes d'insertion professionnelle des jeunes")
-        if "isolement" in self.config["specificites"]:
-            print("• Développer les services à distance et la dématérialisation")
-            print("• Renforcer les partenariats locaux pour améliorer l'accès aux droits")
-        print("• Améliorer la digitalisation des services")
-        print("• Renforcer la prévention des impayés et le recouvrement")
-        print("• Optimiser la gestion des fonds pour maintenir l'équilibre financier")
+        lines.append("\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:")
+        for specificite, recommendations in RECOMMENDATIONS.items():
+            if specificite in self._spec_set:
+                lines.extend(recommendations)
+        lines.append("• Améliorer la digitalisation des services")
+        lines.append("• Renforcer la prévention des impayés et le recouvrement")
+        lines.append("• Optimiser la gestion des fonds pour maintenir l'équilibre financier")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+@functools.lru_cache(maxsize=32)
+def _cached_financial_array(territoire, start_year, end_year, seed):
+    """Simulation mémorisée pour un territoire, une période et une graine donnés"""
+    analyzer = CAF_DROMCOMAnalyzer(territoire, seed=seed)
+    analyzer.start_year = start_year
+    analyzer.end_year = end_year
+    years, data = analyzer._simulate_financial_array()
+    # Les tableaux partagés par le cache ne doivent pas être modifiés
+    years.flags.writeable = False
+    data.flags.writeable = False
+    return years, data
+
+def _run_one(territoire, seed=None, plot=False, save=False, output_format='csv'):
+    """Analyse un territoire dans un processus de travail"""
+    analyzer = CAF_DROMCOMAnalyzer(territoire, seed=seed, interactive=False,
+                                   output_format=output_format)
+    financial_data = analyzer.generate_financial_data()
+    if save:
+        output_file = analyzer.save_financial_data(financial_data)
+        print(f"💾 Données sauvegardées: {output_file}")
+    if plot:
+        _pyplot().switch_backend('Agg')  # Pas de backend graphique dans les processus de travail
+        analyzer.create_financial_analysis(financial_data, verbose=False)
+    return territoire, financial_data
+
+def _territoire_seed(territoire, seed):
+    """Graine propre à un territoire, stable pour un couple (territoire, graine)"""
+    key = zlib.crc32(territoire.encode('utf-8'))
+    return int(np.random.SeedSequence([seed, key]).generate_state(1)[0])
+
+def run_all(territoires, seed=None, plot=False, save=False, output_format='csv'):
+    """Analyse plusieurs territoires en parallèle, un processus par territoire"""
+    # Les résultats sont indexés par territoire: un doublon écraserait l'autre
+    if len(set(territoires)) != len(territoires):
+        raise ValueError("Territoires en double dans la liste")
+    if not territoires:
+        return {}
+    # Une graine indépendante par territoire, dérivée de la graine commune et
+    # du nom du territoire (pas de sa position dans la liste): les flux
+    # aléatoires des processus ne se recouvrent pas, et un territoire donne
+    # les mêmes données quelle que soit la liste où il figure
+    if seed is None:
+        seeds = [None] * len(territoires)
+    else:
+        seeds = [_territoire_seed(territoire, seed) for territoire in territoires]
+    with ProcessPoolExecutor(max_workers=min(len(territoires), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_run_one, territoire, territoire_seed, plot, save, output_format)
+                   for territoire, territoire_seed in zip(territoires, seeds)]
+        return dict(future.result() for future in futures)
 
 def main():
     """Fonction principale pour les CAF DROM-COM"""
@@ -821,32 +834,55 @@ def main():
         "Wallis-et-Futuna", "Polynésie française", "Nouvelle-Calédonie"
     ]
     
+    parser = argparse.ArgumentParser(description="Analyse des comptes des CAF DROM-COM (2002-2025)")
+    # Un seul territoire ou tous: les deux modes s'excluent
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--territoire', choices=territoires, metavar='NOM',
+                      help="territoire à analyser, sans passer par le menu")
+    mode.add_argument('--all', action='store_true',
+                      help="générer et sauvegarder les données de tous les territoires en parallèle")
+    parser.add_argument('--format', choices=CAF_DROMCOMAnalyzer._OUTPUT_FORMATS, default='csv',
+                        help="format des fichiers de données (csv par défaut)")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="ne pas créer le graphique d'analyse")
+    args = parser.parse_args()
+    if args.all and args.no_plot:
+        parser.error("--no-plot est implicite avec --all (aucun graphique n'est créé)")
+    
     print("🏛️ ANALYSE DES COMPTES DES CAF DES 10 DROM-COM (2002-2025)")
     print("=" * 60)
     
-    # Demander à l'utilisateur de choisir un territoire
-    print("Liste des territoires disponibles:")
-    for i, territoire in enumerate(territoires, 1):
-        print(f"{i}. {territoire}")
-    
-    try:
-        choix = int(input("\nChoisissez le numéro du territoire à analyser: "))
-        if choix < 1 or choix > len(territoires):
-            raise ValueError
-        territoire_selectionne = territoires[choix-1]
-    except (ValueError, IndexError):
-        print("Choix invalide. Sélection de La Réunion par défaut.")
-        territoire_selectionne = "La Réunion"
+    # Mode --all: générer et sauvegarder les données de tous les territoires en parallèle
+    if args.all:
+        run_all(territoires, save=True, output_format=args.format)
+        print(f"\n✅ Données des {len(territoires)} CAF DROM-COM générées!")
+        return
+    
+    if args.territoire:
+        territoire_selectionne = args.territoire
+    else:
+        # Demander à l'utilisateur de choisir un territoire
+        print("Liste des territoires disponibles:")
+        for i, territoire in enumerate(territoires, 1):
+            print(f"{i}. {territoire}")
+        
+        try:
+            choix = int(input("\nChoisissez le numéro du territoire à analyser: "))
+            if choix < 1 or choix > len(territoires):
+                raise ValueError
+            territoire_selectionne = territoires[choix-1]
+        except (ValueError, IndexError):
+            print("Choix invalide. Sélection de La Réunion par défaut.")
+            territoire_selectionne = "La Réunion"
     
     # Initialiser l'analyseur
-    analyzer = CAF_DROMCOMAnalyzer(territoire_selectionne)
+    analyzer = CAF_DROMCOMAnalyzer(territoire_selectionne, output_format=args.format)
     
     # Générer les données
     financial_data = analyzer.generate_financial_data()
     
     # Sauvegarder les données
-    output_file = f'CAF_{territoire_selectionne}_financial_data_2002_2025.csv'
-    financial_data.to_csv(output_file, index=False)
+    output_file = analyzer.save_financial_data(financial_data)
     print(f"💾 Données sauvegardées: {output_file}")
     
     # Aperçu des données
@@ -854,8 +890,9 @@ def main():
     print(financial_data[['Annee', 'Nombre_Allocataires', 'Recettes_Totales', 'Depenses_Totales', 'Solde_Compte']].head())
     
     # Créer l'analyse
-    print("\n📈 Création de l'analyse financière...")
-    analyzer.create_financial_analysis(financial_data)
+    if not args.no_plot:
+        print("\n📈 Création de l'analyse financière...")
+        analyzer.create_financial_analysis(financial_data)
     
     print(f"\n✅ Analyse des comptes de CAF {territoire_selectionne} terminée!")
     print(f"📊 Période: {analyzer.start_year}-{analyzer.end_year}")